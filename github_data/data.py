@@ -43,31 +43,38 @@ HTTP_HEADERS = {
     "Authorization": f"token {GH_API_TOKEN}",
 }
 
-def fetch_gh_issue_pr_data(months = 3):
+def fetch_gh_issue_pr_data(months = 3, repo = "apache/arrow"):
     """
-    Get issues and PRs updated in last three months with the GitHub API call.
+    Get issues and PRs updated in the last `months` months with the GitHub API call.
+
+    Parameters
+    ----------
+    months : int
+        Number of months (of 30 days) to look back.
+    repo : string
+        Repository in "owner/name" form, e.g. "apache/arrow-adbc".
 
     Returns
     -------
     data : list
-        list of issues and PRs updated in the last 3 months
+        list of issues and PRs updated in the last `months` months
     """
-    logging.info("Starting to fetch data from GitHub API.")
+    logging.info(f"Starting to fetch data for {repo} from GitHub API.")
 
     data = []
 
-    last_3_months = date.today() - timedelta(days=months*30)
-    last_3_months = last_3_months.strftime("%Y-%m-%dT%H:%M:%SZ")
+    since = date.today() - timedelta(days=months*30)
+    since = since.strftime("%Y-%m-%dT%H:%M:%SZ")
 
     page_number = 1
     while True:
-        logging.info(f"Fetching page {page_number} of issues/PRs updated since {last_3_months}.")
+        logging.info(f"Fetching page {page_number} of issues/PRs updated since {since}.")
 
         resp = requests.get(
-            "https://api.github.com/repos/apache/arrow/issues",
+            f"https://api.github.com/repos/{repo}/issues",
             params={
                 "state": "all",
-                "since": last_3_months,
+                "since": since,
                 "per_page": 100,
                 "page": page_number,
             },
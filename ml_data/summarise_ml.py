@@ -201,21 +201,33 @@ def summarisation_input(threads):
         message_dict_to_string(thread) for thread in threads
     )
     
-def summarise_dev_ml():
+def summarise_threads(threads):
     """
-    Summarizes the development mailing list from the past 3 months using a pre-defined prompt and Google Chat API.
+    Summarizes already parsed mailing list threads using a pre-defined prompt and Google Chat API.
+
+    Args:
+        threads (list[dict]): A list of thread dictionaries.
 
     Returns:
         str: The summarized output.
     """
-    ml.get_messages("dev")
-
-    th2 = read_mbox_as_threads("dev_ml.mbox")
-    thread_string = summarisation_input(th2)
+    thread_string = summarisation_input(threads)
     chat = ChatGoogle(model="gemini-3-flash-preview", api_key=os.getenv("GOOGLE_API_KEY"))
 
     with open("./ml_data/prompt_ml_summary.md", "r", encoding="utf-8") as f:
         chat_prompt = f.read()
 
     summary = chat.chat(chat_prompt, thread_string)
-    return str(summary)
\ No newline at end of file
+    return str(summary)
+
+def summarise_dev_ml():
+    """
+    Summarizes the development mailing list from the past 3 months using a pre-defined prompt and Google Chat API.
+
+    Returns:
+        str: The summarized output.
+    """
+    ml.get_messages("dev")
+
+    th2 = read_mbox_as_threads("dev_ml.mbox")
+    return summarise_threads(th2)
\ No newline at end of file
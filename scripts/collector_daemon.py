@@ -0,0 +1,361 @@
+"""
+Long-running collector that keeps the dashboard data up to date.
+
+Instead of starting a cold Python process per update script, the daemon
+imports everything once and keeps the shared GitHub session and the
+loaded CSV tables in memory. The dev mailing list is only re-summarised
+when its archive has changed. Each update job runs on its own interval in
+a background thread.
+
+A small HTTP endpoint on localhost reports job status and accepts refresh
+requests:
+
+  GET  /status            status of every job (JSON)
+  POST /refresh           run every job now
+  POST /refresh/<job>     run one job now
+  POST /webhook           GitHub webhook deliveries (with --webhooks, see
+                          scripts/gh_webhooks.py)
+
+Only /webhook checks a signature. To let GitHub reach it, either bind with
+--host behind a reverse proxy that forwards /webhook alone, or run
+gh_webhooks.py serve separately; never expose /status or /refresh.
+
+Usage:
+  python scripts/collector_daemon.py run [--host HOST] [--port PORT] [--webhooks] [OWNER/REPO ...]
+  python scripts/collector_daemon.py status [--port PORT]
+  python scripts/collector_daemon.py refresh [--port PORT] [JOB]
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s"
+)
+
+DEFAULT_PORT = 8765
+
+# Seconds between scheduled runs of each job
+JOB_INTERVALS = {
+    "open_counts": 10 * 60,
+    "monthly_commits": 10 * 60,
+    "ml_summary": 24 * 60 * 60,
+}
+
+
+class Job:
+    """An update function run on a fixed interval in its own thread."""
+
+    def __init__(self, name, func, interval):
+        self.name = name
+        self.func = func
+        self.interval = interval
+        self.running = False
+        self.last_started = None
+        self.last_duration = None
+        self.last_error = None
+        self.next_run = time.time()
+        # Set by trigger(); a trigger during a run schedules another run
+        self._pending = False
+        self._wake = threading.Event()
+
+    def trigger(self):
+        """Run the job as soon as possible."""
+        self._pending = True
+        self.next_run = time.time()
+        self._wake.set()
+
+    def loop(self, stop):
+        while not stop.is_set():
+            self._wake.wait(max(self.next_run - time.time(), 0))
+            self._wake.clear()
+            if stop.is_set():
+                break
+            if time.time() < self.next_run:
+                continue
+            self.run()
+
+    def run(self):
+        self._pending = False
+        self.running = True
+        self.last_started = time.time()
+        try:
+            self.func()
+            self.last_error = None
+        except Exception as e:
+            logging.error(f"Job '{self.name}' failed: {e}")
+            self.last_error = str(e)
+        finally:
+            self.last_duration = time.time() - self.last_started
+            self.running = False
+            if self._pending:
+                self.next_run = time.time()
+            else:
+                self.next_run = time.time() + self.interval
+
+    def status(self):
+        return {
+            "interval": self.interval,
+            "running": self.running,
+            "last_started": self.last_started,
+            "last_duration": self.last_duration,
+            "last_error": self.last_error,
+            "next_run": self.next_run,
+        }
+
+
+class TableCache:
+    """
+    Tables loaded from disk, kept until the file changes underneath.
+
+    Entries are keyed by path and invalidated when the file's modification
+    time no longer matches the one recorded when it was loaded or written.
+    """
+
+    def __init__(self):
+        self._tables = {}
+
+    @staticmethod
+    def _mtime(path):
+        return os.stat(path).st_mtime_ns if os.path.exists(path) else None
+
+    def get(self, path, loader):
+        cached = self._tables.get(path)
+        mtime = self._mtime(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        table = loader(path)
+        self._tables[path] = (mtime, table)
+        return table
+
+    def put(self, path, table):
+        self._tables[path] = (self._mtime(path), table)
+
+    def drop(self, path):
+        self._tables.pop(path, None)
+
+
+class Collector:
+    """Update jobs sharing warm sessions and in-memory data."""
+
+    def __init__(self, repos, intervals=None, webhooks=None):
+        # Imported here so the status/refresh client does not need a token
+        import scripts.update_monthly_commits as monthly_commits
+        import scripts.update_open_counts as open_counts
+        from scripts.github_helpers import for_each_repo, repo_data_path
+
+        self._open_counts = open_counts
+        self._monthly_commits = monthly_commits
+        self._for_each_repo = for_each_repo
+        self._repo_data_path = repo_data_path
+
+        self.repos = repos
+        # gh_webhooks.WebhookStore and its secret, when deliveries are accepted
+        self.webhooks = webhooks
+        self.tables = TableCache()
+        self._mbox_digest = None
+
+        intervals = {**JOB_INTERVALS, **(intervals or {})}
+        self.jobs = {
+            "open_counts": Job("open_counts", self.refresh_open_counts, intervals["open_counts"]),
+            "monthly_commits": Job("monthly_commits", self.refresh_monthly_commits, intervals["monthly_commits"]),
+            "ml_summary": Job("ml_summary", self.refresh_ml_summary, intervals["ml_summary"]),
+        }
+        self._stop = threading.Event()
+        self._workers = []
+
+    def _refresh_table(self, module, filename):
+        def update(repo):
+            path = self._repo_data_path(repo, filename)
+            existing = self.tables.get(path, module.read_counts)
+            try:
+                self.tables.put(path, module.update_repo(repo, existing))
+            except Exception:
+                # Reload from disk next time rather than trust the cached copy
+                self.tables.drop(path)
+                raise
+
+        self._for_each_repo(update, self.repos)
+
+    def refresh_open_counts(self):
+        self._refresh_table(self._open_counts, "open_counts.csv")
+
+    def refresh_monthly_commits(self):
+        self._refresh_table(self._monthly_commits, "monthly_commit_counts.csv")
+
+    def refresh_ml_summary(self):
+        """Re-summarise the dev list only when the archive has changed."""
+        import ml_data.data_methods as ml
+        import ml_data.summarise_ml as llm_ml
+        from scripts.update_ml_summary import write_fallback, write_summary
+
+        try:
+            ml.get_messages("dev")
+            with open("dev_ml.mbox", "rb") as f:
+                digest = hashlib.sha256(f.read()).hexdigest()
+            if digest == self._mbox_digest:
+                logging.info("Dev mailing list unchanged, keeping summary")
+                return
+
+            threads = llm_ml.read_mbox_as_threads("dev_ml.mbox")
+            write_summary(llm_ml.summarise_threads(threads))
+        except Exception as e:
+            write_fallback(e)
+            # Retry the summary next time even if the archive is unchanged
+            self._mbox_digest = None
+            raise
+
+        self._mbox_digest = digest
+        logging.info("Wrote dev_ml_summary.txt")
+
+    def start(self):
+        for job in self.jobs.values():
+            worker = threading.Thread(target=job.loop, args=(self._stop,), name=job.name, daemon=True)
+            worker.start()
+            self._workers.append(worker)
+        if self.webhooks is not None:
+            store, _ = self.webhooks
+            worker = threading.Thread(target=store.flush_periodically, args=(self._stop,), name="webhooks", daemon=True)
+            worker.start()
+            self._workers.append(worker)
+
+    def stop(self):
+        self._stop.set()
+        for job in self.jobs.values():
+            job._wake.set()
+        for worker in self._workers:
+            worker.join()
+        if self.webhooks is not None:
+            self.webhooks[0].flush()
+
+    def status(self):
+        return {
+            "repos": self.repos,
+            "jobs": {name: job.status() for name, job in self.jobs.items()},
+            "webhooks": self.webhooks[0].status() if self.webhooks is not None else None,
+        }
+
+
+class ControlHandler(BaseHTTPRequestHandler):
+    """Local status/refresh endpoint; `server.collector` is the Collector."""
+
+    def _send_json(self, code, body):
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        if self.path == "/status":
+            self._send_json(200, self.server.collector.status())
+        else:
+            self._send_json(404, {"error": f"unknown path {self.path}"})
+
+    def do_POST(self):
+        if self.path == "/webhook" and self.server.collector.webhooks is not None:
+            from scripts.gh_webhooks import handle_delivery, read_body
+
+            store, secret = self.server.collector.webhooks
+            body, error = read_body(self)
+            if error is not None:
+                self._send_json(*error)
+                return
+            self._send_json(*handle_delivery(store, secret, self.headers, body))
+            return
+
+        jobs = self.server.collector.jobs
+        parts = self.path.strip("/").split("/")
+        if parts[0] != "refresh" or len(parts) > 2:
+            self._send_json(404, {"error": f"unknown path {self.path}"})
+            return
+        names = parts[1:] or list(jobs)
+        unknown = [name for name in names if name not in jobs]
+        if unknown:
+            self._send_json(404, {"error": f"unknown job {unknown[0]}"})
+            return
+        for name in names:
+            jobs[name].trigger()
+        self._send_json(202, {"triggered": names})
+
+    def log_message(self, format, *args):
+        logging.debug(format % args)
+
+
+def serve(collector, port, host="127.0.0.1"):
+    from scripts.gh_webhooks import shutdown_on_sigterm
+
+    server = ThreadingHTTPServer((host, port), ControlHandler)
+    server.collector = collector
+    collector.start()
+    shutdown_on_sigterm(server)
+    logging.info(f"Collector listening on http://{host}:{port} for {', '.join(collector.repos)}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        logging.info("Shutting down")
+        server.server_close()
+        collector.stop()
+
+
+def request(port, method, path):
+    req = urllib.request.Request(f"http://127.0.0.1:{port}{path}", method=method)
+    with urllib.request.urlopen(req) as resp:
+        return json.load(resp)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--port", type=int, default=DEFAULT_PORT)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", parents=[common], help="start the collector")
+    run.add_argument("repos", nargs="*", default=["apache/arrow"], metavar="OWNER/REPO")
+    run.add_argument("--interval", type=int, help="seconds between GitHub refreshes")
+    run.add_argument("--webhooks", action="store_true", help="accept GitHub webhooks on /webhook")
+    run.add_argument("--host", default="127.0.0.1", help="address to bind (proxy only /webhook)")
+
+    commands.add_parser("status", parents=[common], help="show job status")
+
+    refresh = commands.add_parser("refresh", parents=[common], help="trigger a refresh")
+    refresh.add_argument("job", nargs="?", choices=sorted(JOB_INTERVALS))
+
+    args = parser.parse_args()
+
+    if args.command == "run":
+        intervals = {}
+        if args.interval:
+            intervals = {"open_counts": args.interval, "monthly_commits": args.interval}
+        webhooks = None
+        if args.webhooks:
+            from scripts.gh_webhooks import WebhookStore, webhook_secret
+
+            webhooks = (WebhookStore(), webhook_secret())
+        serve(Collector(args.repos, intervals, webhooks), args.port, args.host)
+    elif args.command == "status":
+        print(json.dumps(request(args.port, "GET", "/status"), indent=2))
+    else:
+        path = f"/refresh/{args.job}" if args.job else "/refresh"
+        print(json.dumps(request(args.port, "POST", path), indent=2))
+
+
+if __name__ == "__main__":
+    main()
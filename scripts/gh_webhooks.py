@@ -0,0 +1,576 @@
+"""
+Apply GitHub webhook deliveries to the local parquet cache.
+
+Handles `issues`, `pull_request`, `pull_request_review` and `workflow_run`
+events. Each delivery's signature is checked against GH_WEBHOOK_SECRET, and
+the payload is queued as an upsert. Queued rows are written in batches so a
+burst of events costs one parquet rewrite per table, not one per event.
+
+Output files:
+  - data/cache/issue_details.parquet
+  - data/cache/pr_details.parquet
+  - data/cache/workflow_runs.parquet
+  (repositories other than apache/arrow under data/cache/repos/<owner>/<name>/)
+
+Only these local files are kept up to date; the dashboard pages do not read
+them (ci_status.qmd queries the API directly), and fetch_latest_activity.R
+still polls on its usual schedule. That script tracks its own watermark in
+data/cache/last_poll.txt, since the rows written here move max(updated_at)
+forward.
+
+Usage:
+  python scripts/gh_webhooks.py serve [--port PORT]
+  python scripts/gh_webhooks.py replay URL PAYLOAD.json [...]
+
+Recorded payloads for `replay` are JSON files holding the event name, the
+body and the expected response, e.g.
+{"event": "issues", "payload": {...}, "expect": {"code": 202, "status": "queued"}}.
+A set covering every event type is in scripts/webhook_payloads/.
+"""
+
+import argparse
+import hashlib
+import hmac
+import json
+import logging
+import os
+import signal
+import threading
+import time
+import sys
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s"
+)
+
+CACHE_DIR = "data/cache"
+DEFAULT_REPO = "apache/arrow"
+DEFAULT_PORT = 8766
+
+# Write queued rows once this many are pending, or after FLUSH_INTERVAL seconds
+FLUSH_EVENTS = 100
+FLUSH_INTERVAL = 60
+
+# Largest request body read, in bytes (GitHub caps deliveries at 25 MB)
+MAX_BODY = 25 * 1024 * 1024
+
+
+def verify_signature(secret, body, signature):
+    """Check an `X-Hub-Signature-256` header against the raw request body."""
+    if not signature or not signature.startswith("sha256="):
+        return False
+    expected = hmac.new(secret.encode("utf-8"), body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(f"sha256={expected}", signature)
+
+
+def sign(secret, body):
+    return "sha256=" + hmac.new(secret.encode("utf-8"), body, hashlib.sha256).hexdigest()
+
+
+def _timestamp(value):
+    return pd.to_datetime(value, utc=True) if value else pd.NaT
+
+
+def issue_row(issue):
+    """Convert an issue payload to a row of issue_details.parquet."""
+    return {
+        "number": issue["number"],
+        "title": issue["title"],
+        "state": issue["state"],
+        "created_at": _timestamp(issue["created_at"]),
+        "updated_at": _timestamp(issue["updated_at"]),
+        "closed_at": _timestamp(issue.get("closed_at")),
+        "user_login": issue["user"]["login"],
+        "body": issue.get("body"),
+        "labels": [label["name"] for label in issue.get("labels", [])],
+        "assignees": [user["login"] for user in issue.get("assignees", [])],
+        "html_url": issue["html_url"],
+    }
+
+
+def pr_row(pr):
+    """
+    Convert a pull request payload to a row of pr_details.parquet.
+
+    `pull_request_review` events carry a reduced pull request object, so
+    only the fields present are returned and the rest of the cached row is
+    kept as is.
+    """
+    row = {
+        "number": pr["number"],
+        "title": pr["title"],
+        "state": pr["state"],
+        "created_at": _timestamp(pr["created_at"]),
+        "updated_at": _timestamp(pr["updated_at"]),
+        "closed_at": _timestamp(pr.get("closed_at")),
+        "user_login": pr["user"]["login"],
+        "author_association": pr.get("author_association"),
+        "body": pr.get("body"),
+        "labels": [label["name"] for label in pr.get("labels", [])],
+        "assignees": [user["login"] for user in pr.get("assignees", [])],
+        "html_url": pr["html_url"],
+        "head_ref": pr["head"]["ref"],
+        "base_ref": pr["base"]["ref"],
+    }
+    if "draft" in pr:
+        row["draft"] = pr["draft"]
+    if "merged_at" in pr:
+        row["merged_at"] = _timestamp(pr["merged_at"])
+    if "merged_by" in pr:
+        row["merged_by"] = (pr["merged_by"] or {}).get("login")
+    return row
+
+
+def workflow_run_row(run):
+    """Convert a workflow run payload to a row of workflow_runs.parquet."""
+    return {
+        "id": run["id"],
+        "name": run.get("name"),
+        "head_branch": run.get("head_branch"),
+        "head_sha": run["head_sha"],
+        "event": run["event"],
+        "status": run["status"],
+        "conclusion": run.get("conclusion"),
+        "run_number": run["run_number"],
+        "run_attempt": run.get("run_attempt"),
+        "created_at": _timestamp(run["created_at"]),
+        "updated_at": _timestamp(run["updated_at"]),
+        "html_url": run["html_url"],
+    }
+
+
+# event name -> (cache file, key column, payload field, row converter)
+EVENTS = {
+    "issues": ("issue_details.parquet", "number", "issue", issue_row),
+    "pull_request": ("pr_details.parquet", "number", "pull_request", pr_row),
+    "pull_request_review": ("pr_details.parquet", "number", "pull_request", pr_row),
+    "workflow_run": ("workflow_runs.parquet", "id", "workflow_run", workflow_run_row),
+}
+
+
+TIMESTAMP_COLUMNS = ["created_at", "updated_at", "closed_at", "merged_at"]
+
+# Issue actions after which the issue no longer belongs to the repository
+REMOVED_ACTIONS = {"deleted", "transferred"}
+
+# Marks a queued row as a deletion
+DELETED = "_deleted"
+
+
+def _is_stale(update, current):
+    """True if `update` was last updated before `current`."""
+    new, old = update.get("updated_at"), current.get("updated_at")
+    return pd.notna(new) and pd.notna(old) and new < old
+
+
+def _merge(pending, value, row):
+    """
+    Queue `row` for key `value` unless an older delivery; returns False if dropped.
+
+    GitHub does not deliver events in order and redeliveries replay old
+    payloads, so rows are compared on `updated_at` rather than arrival.
+    """
+    current = pending.get(value)
+    if current is None:
+        pending[value] = row
+    elif current.get(DELETED):
+        return False
+    elif row.get(DELETED):
+        pending[value] = row
+    elif _is_stale(row, current):
+        return False
+    else:
+        current.update(row)
+    return True
+
+
+def _mtime(path):
+    return os.stat(path).st_mtime_ns if os.path.exists(path) else None
+
+
+def cache_path(repo, filename):
+    """apache/arrow uses data/cache/ directly; other repositories get a partition."""
+    if repo == DEFAULT_REPO:
+        return os.path.join(CACHE_DIR, filename)
+    owner, name = repo.split("/")
+    return os.path.join(CACHE_DIR, "repos", owner, name, filename)
+
+
+def tombstone_path(path):
+    """
+    JSON list of keys removed from the table at `path`.
+
+    Kept next to the table so that a redelivered event cannot bring a
+    deleted or transferred issue back after the deletion has been written.
+    """
+    return path[:-len(".parquet")] + "_deleted.json"
+
+
+def upsert(df, key, pending, deleted=()):
+    """
+    Apply pending changes to a cached table.
+
+    `pending` maps key values to a partial row, merged over the cached row
+    unless that is newer, or to a `DELETED` marker. Rows whose key is in
+    `deleted` are dropped.
+    """
+    if df is None:
+        df = pd.DataFrame(columns=[key])
+    df = df.drop_duplicates(subset=key, keep="last")
+    df = df[~df[key].isin(list(deleted))]
+    touched = df[key].isin(list(pending))
+    existing = df[touched].set_index(key)
+
+    rows = []
+    for value, update in pending.items():
+        if update.get(DELETED) or value in deleted:
+            continue
+        row = existing.loc[value].to_dict() if value in existing.index else {}
+        if not _is_stale(update, row):
+            row.update(update)
+        row[key] = value
+        rows.append(row)
+
+    kept = df[~touched].reset_index(drop=True)
+    if not rows:
+        df = kept
+    elif kept.empty:
+        # Concatenating onto an empty frame would upcast integer columns
+        df = pd.DataFrame(rows)
+    else:
+        df = pd.concat([kept, pd.DataFrame(rows)], ignore_index=True)
+
+    # Fixed type (as written by R) so all-null columns are not saved as naive
+    for column in TIMESTAMP_COLUMNS:
+        if column in df.columns:
+            df[column] = pd.to_datetime(df[column], utc=True).astype("datetime64[us, UTC]")
+    return df
+
+
+class WebhookStore:
+    """Queue of upserts per cache file, flushed to parquet in batches."""
+
+    def __init__(self, flush_events=FLUSH_EVENTS):
+        self.flush_events = flush_events
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        # path -> (key column, {key value: partial row or DELETED marker})
+        self._pending = {}
+        # path -> (file mtime, {key value: updated_at}) of rows on disk
+        self._written = {}
+        # path -> key values removed from the table, see tombstone_path()
+        self._deleted = {}
+        self._count = 0
+        self.applied = 0
+        self.stale = 0
+        self.last_flush = None
+
+    def _deleted_keys(self, path):
+        """Removed keys for `path`, loaded on first use; call with `_lock` held."""
+        if path not in self._deleted:
+            keys = set()
+            if os.path.exists(tombstone_path(path)):
+                with open(tombstone_path(path), "r", encoding="utf-8") as f:
+                    keys = set(json.load(f))
+            self._deleted[path] = keys
+        return self._deleted[path]
+
+    def _written_updated_at(self, path, key):
+        """`updated_at` per key on disk, reloaded if the file changed; call with `_lock` held."""
+        mtime = _mtime(path)
+        cached = self._written.get(path)
+        if cached is None or cached[0] != mtime:
+            index = {}
+            if mtime is not None:
+                df = pd.read_parquet(path, columns=[key, "updated_at"])
+                index = dict(zip(df[key], df["updated_at"]))
+            cached = (mtime, index)
+            self._written[path] = cached
+        return cached[1]
+
+    def apply(self, event, payload):
+        """
+        Queue the change carried by one delivery.
+
+        Returns "queued", "stale" (older than the row already queued or
+        written), "deleted" (the issue was deleted or transferred) or
+        "ignored" (event type not cached).
+        """
+        if event not in EVENTS:
+            return "ignored"
+        filename, key, field, to_row = EVENTS[event]
+        value = payload[field][key]
+        removed = event == "issues" and payload.get("action") in REMOVED_ACTIONS
+        row = {DELETED: True} if removed else to_row(payload[field])
+
+        path = cache_path(payload["repository"]["full_name"], filename)
+        with self._lock:
+            deleted = self._deleted_keys(path)
+            if value in deleted:
+                self.stale += 1
+                return "deleted"
+            if removed:
+                deleted.add(value)
+            elif _is_stale(row, {"updated_at": self._written_updated_at(path, key).get(value)}):
+                self.stale += 1
+                return "stale"
+
+            _, pending = self._pending.setdefault(path, (key, {}))
+            if not _merge(pending, value, row):
+                self.stale += 1
+                return "stale"
+            self._count += 1
+            self.applied += 1
+            full = self._count >= self.flush_events
+
+        if full:
+            try:
+                self.flush()
+            except Exception as e:
+                # The changes stay queued for the next flush
+                logging.error(f"Failed to flush webhook changes: {e}")
+        return "queued"
+
+    def _write(self, path, key, pending):
+        with self._lock:
+            deleted = set(self._deleted_keys(path))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # Record deletions first so they survive a failed table write
+        if any(update.get(DELETED) for update in pending.values()):
+            tmp_path = f"{tombstone_path(path)}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(sorted(deleted), f)
+            os.replace(tmp_path, tombstone_path(path))
+
+        df = pd.read_parquet(path) if os.path.exists(path) else None
+        df = upsert(df, key, pending, deleted)
+        tmp_path = f"{path}.tmp"
+        df.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, path)
+
+        index = dict(zip(df[key], df["updated_at"])) if "updated_at" in df.columns else {}
+        with self._lock:
+            self._written[path] = (_mtime(path), index)
+
+    def flush(self):
+        """
+        Write all queued changes, one rewrite per touched file.
+
+        Batches that fail to write are queued again beneath any newer
+        changes and the first error is raised.
+        """
+        with self._flush_lock:
+            with self._lock:
+                batches, self._pending, self._count = self._pending, {}, 0
+
+            failed = {}
+            error = None
+            for path, (key, pending) in batches.items():
+                try:
+                    self._write(path, key, pending)
+                    logging.info(f"Applied {len(pending)} webhook changes to {path}")
+                except Exception as e:
+                    logging.error(f"Failed to write webhook changes to {path}: {e}")
+                    failed[path] = (key, pending)
+                    error = error or e
+
+            if failed:
+                with self._lock:
+                    for path, (key, unwritten) in failed.items():
+                        self._count += len(unwritten)
+                        _, newer = self._pending.get(path, (key, {}))
+                        for value, row in newer.items():
+                            _merge(unwritten, value, row)
+                        self._pending[path] = (key, unwritten)
+                raise error
+            if batches:
+                self.last_flush = time.time()
+
+    def flush_periodically(self, stop, interval=FLUSH_INTERVAL):
+        while not stop.wait(interval):
+            try:
+                self.flush()
+            except Exception as e:
+                logging.error(f"Failed to flush webhook changes: {e}")
+
+    def status(self):
+        with self._lock:
+            pending = self._count
+        return {
+            "applied": self.applied,
+            "stale": self.stale,
+            "pending": pending,
+            "last_flush": self.last_flush,
+        }
+
+
+def read_body(handler):
+    """
+    Read a request body of at most MAX_BODY bytes.
+
+    Returns (body, None), or (None, (HTTP status, JSON body)) without
+    reading anything if Content-Length is missing, invalid or too large.
+    """
+    try:
+        length = int(handler.headers.get("Content-Length", ""))
+    except ValueError:
+        length = -1
+    if length < 0:
+        return None, (400, {"error": "missing or invalid Content-Length"})
+    if length > MAX_BODY:
+        return None, (413, {"error": f"body larger than {MAX_BODY} bytes"})
+    return handler.rfile.read(length), None
+
+
+def handle_delivery(store, secret, headers, body):
+    """Verify and apply one delivery; returns (HTTP status, JSON body)."""
+    if not verify_signature(secret, body, headers.get("X-Hub-Signature-256")):
+        return 401, {"error": "invalid signature"}
+    event = headers.get("X-GitHub-Event")
+    if event == "ping":
+        return 200, {"status": "pong"}
+    try:
+        status = store.apply(event, json.loads(body))
+    except (KeyError, TypeError, ValueError) as e:
+        logging.warning(f"Malformed {event} delivery: {e}")
+        return 400, {"error": "malformed payload"}
+    return 202, {"status": status}
+
+
+class WebhookHandler(BaseHTTPRequestHandler):
+    """Receiver for POST /webhook; `server.store` and `server.secret` are set by `serve`."""
+
+    def _send_json(self, code, body):
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        if self.path == "/status":
+            self._send_json(200, self.server.store.status())
+        else:
+            self._send_json(404, {"error": f"unknown path {self.path}"})
+
+    def do_POST(self):
+        if self.path != "/webhook":
+            self._send_json(404, {"error": f"unknown path {self.path}"})
+            return
+        body, error = read_body(self)
+        if error is not None:
+            self._send_json(*error)
+            return
+        self._send_json(*handle_delivery(self.server.store, self.server.secret, self.headers, body))
+
+    def log_message(self, format, *args):
+        logging.debug(format % args)
+
+
+def webhook_secret():
+    secret = os.environ.get("GH_WEBHOOK_SECRET")
+    if not secret:
+        logging.error("GitHub webhook secret not found in environment variables.")
+        raise EnvironmentError("GH_WEBHOOK_SECRET environment variable is not set.")
+    return secret
+
+
+def shutdown_on_sigterm(server):
+    """
+    Stop `server.serve_forever()` on SIGTERM, so the caller can flush.
+
+    Must be called from the main thread. `shutdown()` waits for the serve
+    loop, so it is called from another thread rather than in the handler.
+    """
+    def handler(signum, frame):
+        logging.info("Received SIGTERM")
+        threading.Thread(target=server.shutdown).start()
+
+    signal.signal(signal.SIGTERM, handler)
+
+
+def serve(port, host="127.0.0.1"):
+    server = ThreadingHTTPServer((host, port), WebhookHandler)
+    server.secret = webhook_secret()
+    server.store = WebhookStore()
+    stop = threading.Event()
+    flusher = threading.Thread(target=server.store.flush_periodically, args=(stop,), daemon=True)
+    flusher.start()
+    shutdown_on_sigterm(server)
+    logging.info(f"Webhook receiver listening on http://{host}:{port}/webhook")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        logging.info("Shutting down")
+        server.server_close()
+        stop.set()
+        server.store.flush()
+
+
+def replay(url, paths, secret):
+    """
+    POST recorded deliveries to a running receiver, signed with `secret`.
+
+    A recording may set "signature" to send instead of a valid one, and
+    "expect" with the HTTP "code" and response "status" it should get.
+    Returns the number of recordings whose response did not match.
+    """
+    mismatches = 0
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            recorded = json.load(f)
+        body = json.dumps(recorded["payload"]).encode("utf-8")
+        req = urllib.request.Request(url, data=body, method="POST", headers={
+            "Content-Type": "application/json",
+            "X-GitHub-Event": recorded["event"],
+            "X-Hub-Signature-256": recorded.get("signature", sign(secret, body)),
+        })
+        try:
+            with urllib.request.urlopen(req) as resp:
+                code, reply = resp.status, json.load(resp)
+        except urllib.error.HTTPError as e:
+            code, reply = e.code, json.load(e)
+
+        expect = recorded.get("expect", {})
+        ok = code == expect.get("code", code) and reply.get("status") == expect.get("status", reply.get("status"))
+        mismatches += not ok
+        print(f"{'ok  ' if ok else 'FAIL'} {path}: {code} {json.dumps(reply)}")
+    return mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve_cmd = commands.add_parser("serve", help="run the webhook receiver")
+    serve_cmd.add_argument("--port", type=int, default=DEFAULT_PORT)
+    serve_cmd.add_argument("--host", default="127.0.0.1")
+
+    replay_cmd = commands.add_parser("replay", help="send recorded payloads to a receiver")
+    replay_cmd.add_argument("url")
+    replay_cmd.add_argument("payloads", nargs="+")
+
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        serve(args.port, args.host)
+    else:
+        if replay(args.url, args.payloads, webhook_secret()):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,15 @@
 """Shared GitHub API helpers for data update scripts."""
 
+import argparse
 import logging
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, timedelta
 
 import requests
+from requests.adapters import HTTPAdapter
 
 logging.basicConfig(
     level=logging.INFO,
@@ -23,24 +28,99 @@ HTTP_HEADERS = {
 
 OWNER = "apache"
 REPO = "arrow"
+DEFAULT_REPO = f"{OWNER}/{REPO}"
 
+# Upper bound on repositories collected at the same time
+MAX_WORKERS = 8
 
-def fetch_gh_issue_pr_data(months=3):
+# Requests held back per rate limit bucket so other tooling is not starved
+RATE_LIMIT_FLOOR = 10
+
+
+class RateBudget:
+    """
+    GitHub rate limit budget shared by all concurrent workers.
+
+    GitHub reports the remaining quota per resource ("core", "search", ...)
+    in the response headers. Workers call `acquire` before each request and
+    `update` after it; once a bucket drops to `RATE_LIMIT_FLOOR` further
+    requests for that bucket wait until it resets, while requests for other
+    buckets carry on.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._bucket_locks = {}
+        self._remaining = {}
+        self._reset = {}
+
+    def acquire(self, resource):
+        with self._lock:
+            bucket_lock = self._bucket_locks.setdefault(resource, threading.Lock())
+
+        # Only requests for the same bucket queue up behind a wait
+        with bucket_lock:
+            with self._lock:
+                remaining = self._remaining.get(resource)
+                if remaining is None:
+                    return
+                if remaining > RATE_LIMIT_FLOOR:
+                    self._remaining[resource] = remaining - 1
+                    return
+                wait = max(self._reset.get(resource, 0) - time.time(), 0) + 1
+
+            logging.warning(f"  Rate limit for '{resource}' nearly exhausted, waiting {wait:.0f}s")
+            time.sleep(wait)
+            with self._lock:
+                self._remaining.pop(resource, None)
+
+    def update(self, resp):
+        resource = resp.headers.get("X-RateLimit-Resource")
+        remaining = resp.headers.get("X-RateLimit-Remaining")
+        reset = resp.headers.get("X-RateLimit-Reset")
+        if resource is None or remaining is None:
+            return
+        with self._lock:
+            self._remaining[resource] = int(remaining)
+            if reset is not None:
+                self._reset[resource] = int(reset)
+
+
+def _make_session():
+    session = requests.Session()
+    session.headers.update(HTTP_HEADERS)
+    adapter = HTTPAdapter(pool_connections=MAX_WORKERS, pool_maxsize=MAX_WORKERS)
+    session.mount("https://", adapter)
+    return session
+
+
+SESSION = _make_session()
+RATE_BUDGET = RateBudget()
+
+
+def gh_get(url, params=None, resource="core"):
+    """GET a GitHub API URL through the shared session and rate budget."""
+    RATE_BUDGET.acquire(resource)
+    resp = SESSION.get(url, params=params)
+    RATE_BUDGET.update(resp)
+    resp.raise_for_status()
+    return resp
+
+
+def fetch_gh_issue_pr_data(months=3, repo=DEFAULT_REPO):
     """Fetch issues and PRs updated in last N months."""
-    logging.info("Fetching GitHub issue/PR data")
+    logging.info(f"Fetching GitHub issue/PR data for {repo}")
     data = []
     cutoff = date.today() - timedelta(days=months * 30)
     cutoff_str = cutoff.strftime("%Y-%m-%dT%H:%M:%SZ")
 
     page = 1
     while True:
-        logging.info(f"  Fetching page {page}")
-        resp = requests.get(
-            f"https://api.github.com/repos/{OWNER}/{REPO}/issues",
+        logging.info(f"  [{repo}] Fetching page {page}")
+        resp = gh_get(
+            f"https://api.github.com/repos/{repo}/issues",
             params={"state": "all", "since": cutoff_str, "per_page": 100, "page": page},
-            headers=HTTP_HEADERS,
         )
-        resp.raise_for_status()
         items = resp.json()
         data.extend(items)
 
@@ -49,40 +129,108 @@ def fetch_gh_issue_pr_data(months=3):
         else:
             break
 
-    logging.info(f"  Fetched {len(data)} items total")
+    logging.info(f"  [{repo}] Fetched {len(data)} items total")
     return data
 
 
 def gh_search_count(query):
     """Get total_count from GitHub search API."""
-    resp = requests.get(
+    resp = gh_get(
         "https://api.github.com/search/issues",
         params={"q": query},
-        headers=HTTP_HEADERS,
+        resource="search",
     )
-    resp.raise_for_status()
     return resp.json()["total_count"]
 
 
-def fetch_commits(since, until):
+def fetch_commits(since, until, repo=DEFAULT_REPO):
     """Fetch commits between two dates."""
     commits = []
     page = 1
     while True:
-        resp = requests.get(
-            f"https://api.github.com/repos/{OWNER}/{REPO}/commits",
+        resp = gh_get(
+            f"https://api.github.com/repos/{repo}/commits",
             params={
                 "since": f"{since}T00:00:00Z",
                 "until": f"{until}T00:00:00Z",
                 "per_page": 100,
                 "page": page,
             },
-            headers=HTTP_HEADERS,
         )
-        resp.raise_for_status()
         items = resp.json()
         if not items:
             break
         commits.extend(items)
         page += 1
     return commits
+
+
+def repo_data_path(repo, filename, data_dir="data"):
+    """
+    Path of an output file for one repository.
+
+    The default repository keeps writing to `data/<filename>` so the
+    dashboard reads it unchanged; other repositories are partitioned under
+    `data/repos/<owner>/<name>/<filename>`.
+    """
+    if repo == DEFAULT_REPO:
+        directory = data_dir
+    else:
+        owner, name = repo.split("/")
+        directory = os.path.join(data_dir, "repos", owner, name)
+    os.makedirs(directory, exist_ok=True)
+    return os.path.join(directory, filename)
+
+
+def parse_repos(description=None):
+    """Parse repositories (`owner/name`) from the command line."""
+    parser = argparse.ArgumentParser(
+        description=description,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument(
+        "repos",
+        nargs="*",
+        default=[DEFAULT_REPO],
+        metavar="OWNER/REPO",
+        help=f"repositories to collect (default: {DEFAULT_REPO})",
+    )
+    args = parser.parse_args()
+    for repo in args.repos:
+        if repo.count("/") != 1:
+            parser.error(f"invalid repository '{repo}', expected OWNER/REPO")
+    return args.repos
+
+
+def for_each_repo(func, repos):
+    """
+    Run `func(repo)` for every repository concurrently.
+
+    All workers share `SESSION` and `RATE_BUDGET`, so total time follows
+    the slowest repository rather than the sum. A failing repository does
+    not stop the others. Once every worker has finished, an error is raised
+    only if `DEFAULT_REPO` (or every repository) failed, so a transient
+    failure in an extra repository does not hold back the dashboard data.
+
+    Returns
+    -------
+    results : dict
+        Mapping of repository to the value returned by `func`, for the
+        repositories that succeeded.
+    """
+    results = {}
+    failed = []
+    with ThreadPoolExecutor(max_workers=min(len(repos), MAX_WORKERS)) as pool:
+        futures = {repo: pool.submit(func, repo) for repo in repos}
+        for repo, future in futures.items():
+            try:
+                results[repo] = future.result()
+            except Exception as e:
+                logging.error(f"[{repo}] Failed: {e}")
+                failed.append(repo)
+
+    if DEFAULT_REPO in failed or (failed and not results):
+        raise RuntimeError(f"Collection failed for: {', '.join(failed)}")
+    if failed:
+        logging.warning(f"Continuing without: {', '.join(failed)}")
+    return results
@@ -2,6 +2,9 @@
 Fetch and summarize open good-first-issue issues by component.
 
 This is a utility script for quick analysis, not part of the daily update.
+
+Usage:
+  python scripts/good_first_issues_by_component.py [OWNER/REPO ...]
 """
 
 import os
@@ -10,34 +13,34 @@ from collections import Counter
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from scripts.github_helpers import gh_search_count, HTTP_HEADERS, OWNER, REPO
-import requests
-
+from scripts.github_helpers import for_each_repo, gh_get, parse_repos
 
-def main():
-    print("Fetching open good-first-issue issues...")
 
+def fetch_good_first_issues(repo):
     # Fetch all matching issues (paginated)
     issues = []
     page = 1
     while True:
-        resp = requests.get(
+        resp = gh_get(
             "https://api.github.com/search/issues",
             params={
-                "q": f"repo:{OWNER}/{REPO} is:issue state:open label:good-first-issue",
+                "q": f"repo:{repo} is:issue state:open label:good-first-issue",
                 "per_page": 100,
                 "page": page,
             },
-            headers=HTTP_HEADERS,
+            resource="search",
         )
-        resp.raise_for_status()
         data = resp.json()
         issues.extend(data["items"])
 
         if len(data["items"]) < 100:
             break
         page += 1
+    return issues
+
 
+def summarise(repo, issues):
+    print(f"\n=== {repo} ===")
     print(f"Found {len(issues)} issues")
 
     # Extract component labels
@@ -63,5 +66,13 @@ def main():
     print(f"\nTotal: {len(issues)} issues across {len(components)} components")
 
 
+def main(repos):
+    print("Fetching open good-first-issue issues...")
+    results = for_each_repo(fetch_good_first_issues, repos)
+    for repo in repos:
+        if repo in results:
+            summarise(repo, results[repo])
+
+
 if __name__ == "__main__":
-    main()
+    main(parse_repos(__doc__))
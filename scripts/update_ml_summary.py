@@ -19,19 +19,29 @@ logging.basicConfig(
 )
 
 
+SUMMARY_PATH = "data/dev_ml_summary.txt"
+
+
+def write_summary(summary):
+    os.makedirs("data", exist_ok=True)
+    with open(SUMMARY_PATH, "w", encoding="utf-8") as f:
+        f.write(summary)
+
+
+def write_fallback(error):
+    """Replace the summary with a failure note so a stale one is not shown."""
+    logging.warning(f"Failed to generate ML summary: {error}")
+    write_summary("Summary generation failed. Please check the mailing list directly.")
+
+
 def main():
     logging.info("=== Generating dev mailing list summary ===")
-    os.makedirs("data", exist_ok=True)
 
     try:
-        summary = llm_ml.summarise_dev_ml()
-        with open("data/dev_ml_summary.txt", "w", encoding="utf-8") as f:
-            f.write(summary)
+        write_summary(llm_ml.summarise_dev_ml())
         logging.info("Wrote dev_ml_summary.txt")
     except Exception as e:
-        logging.warning(f"Failed to generate ML summary: {e}")
-        with open("data/dev_ml_summary.txt", "w", encoding="utf-8") as f:
-            f.write("Summary generation failed. Please check the mailing list directly.")
+        write_fallback(e)
 
 
 if __name__ == "__main__":
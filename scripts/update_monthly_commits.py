@@ -2,7 +2,11 @@
 Update monthly commit counts.
 
 Output file:
-  - data/monthly_commit_counts.csv
+  - data/monthly_commit_counts.csv (apache/arrow)
+  - data/repos/<owner>/<name>/monthly_commit_counts.csv (other repositories)
+
+Usage:
+  python scripts/update_monthly_commits.py [OWNER/REPO ...]
 """
 
 import logging
@@ -14,7 +18,7 @@ import pandas as pd
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from scripts.github_helpers import fetch_commits
+from scripts.github_helpers import fetch_commits, for_each_repo, parse_repos, repo_data_path
 
 logging.basicConfig(
     level=logging.INFO,
@@ -22,33 +26,54 @@ logging.basicConfig(
 )
 
 
-def main():
-    logging.info("=== Updating monthly commit counts ===")
-    os.makedirs("data", exist_ok=True)
+def read_counts(csv_path):
+    """Load recorded monthly counts (empty table if none yet)."""
+    if os.path.exists(csv_path):
+        return pd.read_csv(csv_path)
+    return pd.DataFrame(columns=["month", "commit_count"])
+
+
+def update_repo(repo, existing=None):
+    """
+    Update the running commit count of the current month for `repo`.
 
-    csv_path = "data/monthly_commit_counts.csv"
+    `existing` may be passed in by a caller that keeps the table in memory;
+    otherwise it is read from disk. Returns the up-to-date table.
+    """
+    csv_path = repo_data_path(repo, "monthly_commit_counts.csv")
     current_month = date.today().strftime("%Y-%m")
     month_start = date.today().replace(day=1)
 
-    if os.path.exists(csv_path):
-        existing = pd.read_csv(csv_path)
+    if existing is None:
+        existing = read_counts(csv_path)
     else:
-        existing = pd.DataFrame(columns=["month", "commit_count"])
+        # Leave the caller's copy untouched in case the write below fails
+        existing = existing.copy()
 
     # Current month (running total)
-    commits = fetch_commits(month_start, date.today() + timedelta(days=1))
+    commits = fetch_commits(month_start, date.today() + timedelta(days=1), repo=repo)
     current_count = len(commits)
 
     if current_month in existing["month"].values:
+        previous = existing.loc[existing["month"] == current_month, "commit_count"].iloc[0]
+        if previous == current_count:
+            logging.info(f"[{repo}] {current_month} unchanged: {current_count} commits")
+            return existing
         existing.loc[existing["month"] == current_month, "commit_count"] = current_count
-        logging.info(f"Updated {current_month}: {current_count} commits")
+        logging.info(f"[{repo}] Updated {current_month}: {current_count} commits")
     else:
         existing = pd.concat([existing, pd.DataFrame([{"month": current_month, "commit_count": current_count}])],
                             ignore_index=True)
-        logging.info(f"Added {current_month}: {current_count} commits")
+        logging.info(f"[{repo}] Added {current_month}: {current_count} commits")
 
     existing.to_csv(csv_path, index=False)
+    return existing
+
+
+def main(repos):
+    logging.info("=== Updating monthly commit counts ===")
+    for_each_repo(update_repo, repos)
 
 
 if __name__ == "__main__":
-    main()
+    main(parse_repos(__doc__))
@@ -2,7 +2,11 @@
 Update daily open issue/PR counts snapshot.
 
 Output file:
-  - data/open_counts.csv
+  - data/open_counts.csv (apache/arrow)
+  - data/repos/<owner>/<name>/open_counts.csv (other repositories)
+
+Usage:
+  python scripts/update_open_counts.py [OWNER/REPO ...]
 """
 
 import logging
@@ -14,7 +18,7 @@ import pandas as pd
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from scripts.github_helpers import gh_search_count, OWNER, REPO
+from scripts.github_helpers import for_each_repo, gh_search_count, parse_repos, repo_data_path
 
 logging.basicConfig(
     level=logging.INFO,
@@ -22,31 +26,50 @@ logging.basicConfig(
 )
 
 
-def main():
-    logging.info("=== Updating open counts ===")
-    os.makedirs("data", exist_ok=True)
+def read_counts(csv_path):
+    """Load recorded counts, or None if nothing has been recorded yet."""
+    if not os.path.exists(csv_path):
+        return None
+    existing = pd.read_csv(csv_path, parse_dates=["date"])
+    existing["date"] = existing["date"].dt.date
+    return existing
+
+
+def update_repo(repo, existing=None):
+    """
+    Record today's open counts for `repo`.
 
+    `existing` may be passed in by a caller that keeps the table in memory;
+    otherwise it is read from disk. Returns the up-to-date table.
+    """
     today = date.today()
-    csv_path = "data/open_counts.csv"
+    csv_path = repo_data_path(repo, "open_counts.csv")
 
-    open_issues = gh_search_count(f"repo:{OWNER}/{REPO} is:issue state:open")
-    open_prs = gh_search_count(f"repo:{OWNER}/{REPO} is:pr state:open")
+    if existing is None:
+        existing = read_counts(csv_path)
+    if existing is not None and today in existing["date"].values:
+        logging.info(f"[{repo}] Open counts already recorded for today")
+        return existing
+
+    open_issues = gh_search_count(f"repo:{repo} is:issue state:open")
+    open_prs = gh_search_count(f"repo:{repo} is:pr state:open")
 
     new_row = pd.DataFrame([{"date": today, "open_issues": open_issues, "open_prs": open_prs}])
 
-    if os.path.exists(csv_path):
-        existing = pd.read_csv(csv_path, parse_dates=["date"])
-        existing["date"] = existing["date"].dt.date
-        if today in existing["date"].values:
-            logging.info("Open counts already recorded for today")
-            return
+    if existing is not None:
         df = pd.concat([existing, new_row], ignore_index=True)
     else:
         df = new_row
 
     df.to_csv(csv_path, index=False)
-    logging.info(f"Recorded: {open_issues} issues, {open_prs} PRs")
+    logging.info(f"[{repo}] Recorded: {open_issues} issues, {open_prs} PRs")
+    return df
+
+
+def main(repos):
+    logging.info("=== Updating open counts ===")
+    for_each_repo(update_repo, repos)
 
 
 if __name__ == "__main__":
-    main()
+    main(parse_repos(__doc__))